@@ -11,7 +11,10 @@ MODELS_DIR = os.path.join(PROJECT_ROOT, "models")
 
 RAW_DATA_FILE = "AHIES2022Q1_2023Q3_SEC01234_202402.csv"
 SELECTED_DATA_FILE = "ahies_selected_for_ev_propensity.csv"
-CLEANED_DATA_FILE = "ahies_cleaned_for_eda.csv"
+CLEANED_DATA_FILE = "ahies_cleaned_for_eda.parquet"
+
+# Encoding of the raw AHIES CSV (checked once with utils.detect_encoding)
+RAW_DATA_ENCODING = "ISO-8859-1"
 
 RAW_DATA_PATH = os.path.join(RAW_DATA_DIR, RAW_DATA_FILE)
 SELECTED_DATA_PATH = os.path.join(INTERMEDIATE_DATA_DIR, SELECTED_DATA_FILE)
@@ -48,6 +51,33 @@ COLUMNS_TO_EXTRACT = {
     "s4aq1": "worked_last_7_days",
 }
 
+# --- Raw Column dtypes (applied at read time, keyed by raw AHIES name) ---
+# Label columns become 'category' after parsing, so integer codes stay numeric (1, not '1').
+RAW_COLUMN_DTYPES = {
+    "hhid": "int32",
+    "personid": "int32",
+    "region": "category",
+    "urbrur": "category",
+    "s1aq1": "category",
+    "s1aq5": "category",
+    "s2aq3": "category",
+    "s2aq4": "float32",
+    "s2aq6": "category",
+    "s4aq55a": "float32",
+    "s4bq9": "float32",
+    "s2aq11a2": "float32",
+    "s2aq11a15": "float32",
+    "s2aq11a16": "float32",
+    "s3aq21": "float32",
+    "s4aq1": "category",
+}
+
+# Numeric columns coerced after reading instead of parsed strictly: values such as a
+# top-coded age ('98+') become missing rather than making the whole file unreadable.
+RAW_LENIENT_NUMERIC_DTYPES = {
+    "s1aq4y": "Int16",
+}
+
 # --- NEW: Columns to Drop ---
 COLUMNS_TO_DROP_AFTER_AGE_FILTER = [
     'tuition_fee_paid_last_12m',
@@ -57,6 +87,8 @@ COLUMNS_TO_DROP_AFTER_AGE_FILTER = [
 ]
 
 # --- Data Cleaning Parameters (Updated) ---
+MINIMUM_AGE_FOR_ANALYSIS = 30
+
 IMPUTATION_STRATEGIES = {
     'highest_education_level': 'mode',
     'grade_completed': 'median',
@@ -97,6 +129,22 @@ SEX_MAP = {
     2: 'Female'
 }
 
+# 'worked_last_7_days' is kept as a nullable boolean; accepts GSS codes (1=Yes, 2=No) or labels.
+# Codes read with gaps arrive as 1.0/2.0, which match the integer keys (1.0 == 1).
+WORKED_LAST_7_DAYS_MAP = {
+    1: True,
+    2: False,
+    'Yes': True,
+    'No': False
+}
+
+# Columns decoded together by data_processing.decode_categoricals
+CATEGORICAL_DECODE_MAPS = {
+    'region': REGION_MAP,
+    'urban_rural': URBAN_RURAL_MAP,
+    'sex': SEX_MAP,
+}
+
 # Add more maps as needed...
 
 if __name__ == "__main__":
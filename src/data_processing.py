@@ -2,51 +2,243 @@
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:  # PyArrow is optional; fall back to the pandas reader
+    pa = None
+    pacsv = None
+    pq = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the NumPy kernel is used instead
+    njit = None
+    prange = range
+
+try:
+    from .config import (
+        COLUMNS_TO_EXTRACT, RAW_COLUMN_DTYPES, RAW_LENIENT_NUMERIC_DTYPES, RAW_DATA_ENCODING, WORKED_LAST_7_DAYS_MAP,
+        COLUMNS_TO_DROP_AFTER_AGE_FILTER, IMPUTATION_STRATEGIES, MINIMUM_AGE_FOR_ANALYSIS,
+        RAW_DATA_PATH, CLEANED_DATA_PATH,
+    )
+except ImportError:  # Run as a script (python src/data_processing.py)
+    from config import (
+        COLUMNS_TO_EXTRACT, RAW_COLUMN_DTYPES, RAW_LENIENT_NUMERIC_DTYPES, RAW_DATA_ENCODING, WORKED_LAST_7_DAYS_MAP,
+        COLUMNS_TO_DROP_AFTER_AGE_FILTER, IMPUTATION_STRATEGIES, MINIMUM_AGE_FOR_ANALYSIS,
+        RAW_DATA_PATH, CLEANED_DATA_PATH,
+    )
+
+def _read_csv_arrow(file_path, columns, encoding):
+    """Reads only `columns` from the CSV with PyArrow's multi-threaded parser."""
+    table = pacsv.read_csv(
+        file_path,
+        read_options=pacsv.ReadOptions(encoding=encoding, block_size=64 << 20, use_threads=True),
+        parse_options=pacsv.ParseOptions(delimiter=','),
+        convert_options=pacsv.ConvertOptions(include_columns=columns, strings_can_be_null=True),
+    )
+    # self_destruct releases each Arrow column as soon as it has been converted
+    df = table.to_pandas(self_destruct=True)
+    return _apply_raw_dtypes(df)
+
+def _apply_raw_dtypes(df):
+    """Casts freshly read columns to RAW_COLUMN_DTYPES and RAW_LENIENT_NUMERIC_DTYPES.
+
+    Shared by both readers so they return identical frames: 'category' is applied after
+    parsing, so integer-coded label columns keep numeric categories (1, not '1').
+    """
+    df = df.astype({col: dtype for col, dtype in RAW_COLUMN_DTYPES.items() if col in df.columns})
+    return _coerce_lenient_numeric(df)
+
+def _coerce_lenient_numeric(df):
+    """Converts the RAW_LENIENT_NUMERIC_DTYPES columns, turning unparseable values (e.g. '98+') into missing."""
+    for col, dtype in RAW_LENIENT_NUMERIC_DTYPES.items():
+        if col not in df.columns:
+            continue
+        values = pd.to_numeric(df[col], errors='coerce')
+        coerced_count = int(values.isna().sum() - df[col].isna().sum())
+        if coerced_count:
+            print(f"⚠️ Warning: {coerced_count} values in '{col}' are not numeric and were set to missing.")
+        try:
+            df[col] = values.astype(dtype)
+        except (ValueError, TypeError):  # e.g. fractional values that do not fit an integer dtype
+            df[col] = values
+    return df
 
-def load_raw_data(file_path):
-    """Loads the AHIES dataset from the specified path, trying different encodings."""
+def _read_csv_pandas(file_path, columns, encoding):
+    """Reads only `columns` from the CSV with the pandas C parser and explicit dtypes."""
+    wanted = set(columns)
+    df = pd.read_csv(
+        file_path,
+        usecols=lambda col: col in wanted,  # Tolerates missing columns; reported by select_and_rename_cols
+        # 'category' at parse time would turn every category into a string; cast afterwards instead
+        dtype={col: dtype for col, dtype in RAW_COLUMN_DTYPES.items() if col in wanted and dtype != 'category'},
+        encoding=encoding,
+        engine="c",
+        low_memory=False,
+    )
+    return _apply_raw_dtypes(df)
+
+# Process-local cache of loaded raw files: (abs path, mtime_ns, size, column map) -> DataFrame
+_LOAD_CACHE = {}
+
+def _copy_on_write_enabled():
+    """True when pandas Copy-on-Write is active (always from pandas 3, opt-in before that)."""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
+def load_raw_data(file_path, column_map=COLUMNS_TO_EXTRACT):
+    """Loads the AHIES dataset from the specified path using RAW_DATA_ENCODING.
+
+    Only the columns in `column_map` are parsed (with the dtypes in RAW_COLUMN_DTYPES and
+    RAW_LENIENT_NUMERIC_DTYPES) and they are renamed on load. PyArrow is used when
+    installed, falling back to the pandas reader if PyArrow cannot parse the file.
+
+    Results are cached for the rest of the process while the file's mtime and size are
+    unchanged. Each call gets its own copy: a shallow one under Copy-on-Write, a deep
+    one otherwise, so edits never reach the cached frame. Set the environment variable
+    DISABLE_LOAD_CACHE=1 to always re-read.
+    """
     if not os.path.exists(file_path):
         print(f"❌ Error: File not found at '{file_path}'.")
         return None
 
-    try:
-        df = pd.read_csv(file_path, encoding="ISO-8859-1", low_memory=False)
-        print(f"✅ File loaded with ISO-8859-1 encoding from '{file_path}'.")
+    use_cache = os.environ.get("DISABLE_LOAD_CACHE") != "1"
+    if use_cache:
+        stat = os.stat(file_path)
+        cache_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, tuple(column_map.items()))
+        cached = _LOAD_CACHE.get(cache_key)
+        if cached is not None:
+            print(f"✅ Reusing cached data for '{file_path}' (file unchanged since last load).")
+            return cached.copy(deep=not _copy_on_write_enabled())
+
+    df = _read_raw_data(file_path, column_map)
+    if df is None or not use_cache:
         return df
-    except UnicodeDecodeError:
+
+    # Keep only the latest version of each file
+    for stale_key in [key for key in _LOAD_CACHE if key[0] == cache_key[0]]:
+        del _LOAD_CACHE[stale_key]
+    _LOAD_CACHE[cache_key] = df
+    return df.copy(deep=not _copy_on_write_enabled())
+
+def _read_raw_data(file_path, column_map):
+    """Reads and renames the columns in `column_map`, trying PyArrow first, then pandas."""
+    columns = list(column_map.keys())
+    df = None
+
+    if pacsv is not None:
+        try:
+            df = _read_csv_arrow(file_path, columns, RAW_DATA_ENCODING)
+            print(f"✅ File loaded with PyArrow ({RAW_DATA_ENCODING} encoding) from '{file_path}'.")
+        except (pa.ArrowInvalid, pa.ArrowKeyError, ValueError, TypeError) as e:
+            # ValueError/TypeError: a column could not be cast to its RAW_COLUMN_DTYPES dtype
+            print(f"⚠️ PyArrow could not parse the file ({e}). Falling back to pandas...")
+
+    if df is None:
         try:
-            df = pd.read_csv(file_path, encoding="windows-1252", low_memory=False)
-            print(f"✅ File loaded with windows-1252 encoding from '{file_path}'.")
-            return df
+            df = _read_csv_pandas(file_path, columns, RAW_DATA_ENCODING)
+            print(f"✅ File loaded with {RAW_DATA_ENCODING} encoding from '{file_path}'.")
         except Exception as e:
-            print(f"❌ Error loading file with windows-1252: {e}")
+            print(f"❌ An unexpected error occurred while loading: {e}")
             return None
-    except Exception as e:
-        print(f"❌ An unexpected error occurred while loading: {e}")
-        return None
+
+    df.rename(columns=column_map, inplace=True)
+    return optimize_dtypes(df)
+
+def optimize_dtypes(df, max_categories=50):
+    """Downcasts numeric columns and stores low-cardinality text columns as 'category'."""
+    if df is None or df.empty:
+        print("❌ Input dataframe is empty. Cannot optimize dtypes.")
+        return df
+
+    memory_before = df.memory_usage(deep=True).sum()
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='float')
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if series.nunique(dropna=True) <= max_categories:
+                df[col] = series.astype('category')
+
+    memory_after = df.memory_usage(deep=True).sum()
+    print(f"✅ Dtypes optimized: {memory_before / 1e6:.1f} MB -> {memory_after / 1e6:.1f} MB.")
+    return df
 
 def select_and_rename_cols(df, column_map):
-    """Selects and renames columns based on a dictionary."""
+    """Selects and renames columns based on a dictionary.
+
+    Columns that already carry their new name (as returned by load_raw_data) are
+    kept as-is, so on freshly loaded data this is a no-op.
+    """
     if df is None or df.empty:
         print("❌ Input dataframe is empty. Cannot select columns.")
         return None
 
-    existing_cols = {
-        orig: new for orig, new in column_map.items() if orig in df.columns
-    }
-    missing = set(column_map.keys()) - set(existing_cols.keys())
+    existing_cols = {}
+    for orig, new in column_map.items():
+        if orig in df.columns:
+            existing_cols[orig] = new
+        elif new in df.columns:
+            existing_cols[new] = new
+    missing = [orig for orig, new in column_map.items() if orig not in df.columns and new not in df.columns]
     if missing:
-        print(f"⚠️ Warning: These columns were not found and skipped: {sorted(list(missing))}")
+        print(f"⚠️ Warning: These columns were not found and skipped: {sorted(missing)}")
 
     if not existing_cols:
         print("❌ Error: None of the specified columns exist.")
         return None
 
-    df_selected = df[list(existing_cols.keys())].copy()
-    df_selected.rename(columns=existing_cols, inplace=True)
+    if list(existing_cols.values()) == df.columns.tolist():
+        print(f"✅ {len(existing_cols)} columns already selected and renamed.")
+        return df
+
+    # No explicit copy: the selection shares data with df under Copy-on-Write
+    df_selected = df[list(existing_cols.keys())].rename(columns=existing_cols)
     print(f"✅ {len(existing_cols)} columns selected and renamed.")
     return df_selected
 
+def display_missing_values_summary(df, show_all=False):
+    """Prints the columns with missing values (most missing first) and returns the summary table.
+
+    Only columns with missing values are included unless `show_all=True`.
+    """
+    if df is None or df.empty:
+        print("❌ Input dataframe is empty. Cannot summarize missing values.")
+        return None
+
+    total_rows = len(df)
+    # One null mask, summed per column
+    counts = df.isna().to_numpy().sum(axis=0)
+    keep = np.ones(len(counts), dtype=bool) if show_all else counts > 0
+    columns = df.columns[keep]
+    summary_df = pd.DataFrame({
+        'Column Name': columns,
+        'Missing Values': counts[keep],
+        'Percentage Missing (%)': counts[keep] * (100.0 / total_rows),
+        'Total Rows': total_rows,
+    }, index=columns)
+
+    print("\n--- Missing Values Summary ---")
+    missing_df = summary_df[summary_df['Missing Values'] > 0].sort_values('Missing Values', ascending=False)
+    if missing_df.empty:
+        print("✅ No missing values found.")
+    else:
+        print(missing_df.to_string(index=False))
+    print(f"\nTotal rows in DataFrame: {total_rows}")
+    return summary_df
+
+# Integer dtypes whose values always fit int16, so the age mask can be built with a single cast
+_INT16_SAFE_DTYPES = {'int8', 'int16', 'uint8', 'Int8', 'Int16', 'UInt8'}
+
 def filter_by_age(df, min_age, age_column='age'):
     """Filters the DataFrame to include only rows where age is >= min_age."""
     if df is None or df.empty:
@@ -57,66 +249,130 @@ def filter_by_age(df, min_age, age_column='age'):
         return df # Return original df or None, depending on desired behavior
 
     original_rows = len(df)
-    # Ensure age column is numeric, coercing errors if necessary
-    # This step might be better placed in a dedicated type conversion function earlier
-    # but is included here for robustness if not already done.
-    if not pd.api.types.is_numeric_dtype(df[age_column]):
+    # Age is read as a small nullable integer (see RAW_LENIENT_NUMERIC_DTYPES); only coerce if it is not numeric
+    ages = df[age_column]
+    if not pd.api.types.is_numeric_dtype(ages):
         print(f"⚠️ Warning: Age column '{age_column}' is not numeric. Attempting conversion...")
-        df[age_column] = pd.to_numeric(df[age_column], errors='coerce')
-        if df[age_column].isnull().any():
-            print(f"   ⚠️ Some age values could not be converted to numeric and are now NaN. These rows will be excluded by the age filter if not handled.")
+        ages = pd.to_numeric(ages, errors='coerce')
+        if ages.isnull().any():
+            print(f"   ⚠️ Some age values could not be converted to numeric and are now NaN. These rows will be excluded by the age filter.")
 
-    df_filtered = df[df[age_column] >= min_age].copy()
+    if ages.dtype.name in _INT16_SAFE_DTYPES:
+        # Missing ages become int16 min, so they always fail the comparison
+        mask = ages.to_numpy(dtype='int16', na_value=np.iinfo(np.int16).min) >= min_age
+    else:
+        # Floats or wider integers: compare without casting
+        mask = (ages >= min_age).fillna(False).to_numpy(dtype=bool)
+    df_filtered = df.iloc[mask]
     filtered_rows = len(df_filtered)
     rows_removed = original_rows - filtered_rows
 
     print(f"✅ Filtered by age: {filtered_rows} rows remaining (>= {min_age} years). {rows_removed} rows removed.")
     return df_filtered
 
-def impute_missing_values(df, strategies):
-    """Imputes missing values based on a dictionary of strategies ('median', 'mode', or a specific value)."""
-    if df is None or df.empty:
-        print("❌ Input dataframe is empty. Cannot impute.")
+def _mode(series):
+    """Most frequent non-missing value of `series`, or None if there is none.
+
+    Works from value_counts, so this skips the sort of unique values done by Series.mode().
+    """
+    return _mode_from_counts(series.value_counts(dropna=True))
+
+def _mode_from_counts(counts):
+    """Most frequent value in a value_counts-style Series, or None if nothing was counted.
+
+    Ties go to the smallest value, so the batch pipeline (counts of one frame) and
+    stream_pipeline (counts summed over chunks) pick the same fill value.
+    """
+    # Categoricals also list unobserved categories, with a count of 0
+    counts = counts[counts > 0]
+    if counts.empty:
         return None
+    return min(counts.index[counts.to_numpy() == counts.max()])
 
-    print("\n--- Starting Generic Missing Value Imputation ---")
-    df_cleaned = df.copy()
-    imputed_cols_count = 0
+def _build_imputation_plan(df, strategies):
+    """Resolves each strategy to a fill value.
 
+    Returns (fill_values, new_categories, strategy_report): the {column: value} map for a
+    single fillna call, the {column: value} fill values that categorical columns must first
+    accept as a new category, and the log lines, in strategy order.
+    """
+    present_cols = [col for col in strategies if col in df.columns]
+    has_missing = df[present_cols].isna().any()
+
+    # Every median in one pass and every mode once
+    median_cols = [
+        col for col in present_cols
+        if strategies[col] == 'median' and has_missing[col] and pd.api.types.is_numeric_dtype(df[col])
+    ]
+    medians = df[median_cols].median() if median_cols else pd.Series(dtype='float64')
+    modes = {}
+    for col in present_cols:
+        if strategies[col] == 'mode' and has_missing[col]:
+            mode_val = _mode(df[col])
+            if mode_val is not None:
+                modes[col] = mode_val
+
+    fill_values = {}
+    new_categories = {}
+    strategy_report = []
     for col, strategy in strategies.items():
-        if col not in df_cleaned.columns:
-            print(f"ℹ️ Column '{col}' not found for imputation, skipping.")
+        if col not in df.columns:
+            strategy_report.append(f"ℹ️ Column '{col}' not found for imputation, skipping.")
+            continue
+        if not has_missing[col]:
+            strategy_report.append(f"ℹ️ No missing values found in '{col}'.")
             continue
 
-        if df_cleaned[col].isnull().any():
-            value_to_impute = None # Initialize
-            if strategy == 'median':
-                if not pd.api.types.is_numeric_dtype(df_cleaned[col]):
-                    print(f"⚠️ Warning: Column '{col}' is not numeric. Cannot calculate median. Skipping.")
-                    continue
-                value_to_impute = df_cleaned[col].median()
-            elif strategy == 'mode':
-                mode_series = df_cleaned[col].mode()
-                if mode_series.empty:
-                    print(f"⚠️ Warning: Column '{col}' is all NaN or mode could not be determined. Skipping.")
-                    continue
-                value_to_impute = mode_series[0]
-            elif isinstance(strategy, (int, float, str)):
-                 value_to_impute = strategy
-            else:
-                print(f"⚠️ Unknown strategy '{strategy}' for column '{col}'. Skipping.")
+        if strategy == 'median':
+            if col not in medians.index:
+                strategy_report.append(f"⚠️ Warning: Column '{col}' is not numeric. Cannot calculate median. Skipping.")
                 continue
+            value_to_impute = float(medians[col])
+        elif strategy == 'mode':
+            if col not in modes:
+                strategy_report.append(f"⚠️ Warning: Column '{col}' is all NaN or mode could not be determined. Skipping.")
+                continue
+            value_to_impute = modes[col]
+        elif isinstance(strategy, (int, float, str)):
+            value_to_impute = strategy
+        else:
+            strategy_report.append(f"⚠️ Unknown strategy '{strategy}' for column '{col}'. Skipping.")
+            continue
+
+        fill_values[col] = value_to_impute
+        # Label columns are categorical; a constant fill value may not be one of their categories yet
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and value_to_impute not in df[col].cat.categories:
+            new_categories[col] = value_to_impute
+        value_display = f"{value_to_impute:.2f}" if isinstance(value_to_impute, (int, float)) else str(value_to_impute)
+        strategy_report.append(f"✅ Missing '{col}' values imputed with {strategy} ({value_display}).")
+
+    return fill_values, new_categories, strategy_report
+
+def impute_missing_values(df, strategies, inplace=False):
+    """Imputes missing values based on a dictionary of strategies ('median', 'mode', or a specific value).
 
-            df_cleaned[col].fillna(value_to_impute, inplace=True)
-            
-            # Corrected print statement:
-            value_display = f"{value_to_impute:.2f}" if isinstance(value_to_impute, (int, float)) else str(value_to_impute)
-            print(f"✅ Missing '{col}' values imputed with {strategy} ({value_display}).")
-            imputed_cols_count += 1
+    All fill values are resolved first, then applied with one fillna call.
+    Returns a new DataFrame unless `inplace=True`, in which case `df` itself is filled and returned.
+    """
+    if df is None or df.empty:
+        print("❌ Input dataframe is empty. Cannot impute.")
+        return None
+
+    print("\n--- Starting Generic Missing Value Imputation ---")
+    fill_values, new_categories, strategy_report = _build_imputation_plan(df, strategies)
+
+    df_cleaned = df if inplace else df.copy(deep=False)
+    for col, value in new_categories.items():
+        df_cleaned[col] = df_cleaned[col].cat.add_categories([value])
+    if fill_values:
+        if inplace:
+            df_cleaned.fillna(value=fill_values, inplace=True)
         else:
-            print(f"ℹ️ No missing values found in '{col}'.")
+            df_cleaned = df_cleaned.fillna(value=fill_values)
 
-    print(f"--- Generic Imputation finished. {imputed_cols_count} columns processed. ---")
+    for line in strategy_report:
+        print(line)
+    print(f"--- Generic Imputation finished. {len(fill_values)} columns processed. ---")
     return df_cleaned
 
 
@@ -127,126 +383,530 @@ def drop_columns(df, columns_to_drop):
         print("❌ Input dataframe is empty. Cannot drop columns.")
         return None
         
-    original_cols = df.columns.tolist()
-    cols_found = [col for col in columns_to_drop if col in original_cols]
-    cols_not_found = [col for col in columns_to_drop if col not in original_cols]
+    # Hashed Index set operations instead of list membership checks; sort=False keeps the requested order
+    to_drop = pd.Index(columns_to_drop)
+    cols_found = to_drop.intersection(df.columns, sort=False)
+    cols_not_found = to_drop.difference(df.columns, sort=False)
 
-    if cols_not_found:
-        print(f"ℹ️ These columns to drop were not found: {cols_not_found}")
+    if len(cols_not_found):
+        print(f"ℹ️ These columns to drop were not found: {cols_not_found.tolist()}")
 
-    if not cols_found:
+    if cols_found.empty:
         print("ℹ️ No columns to drop were found in the DataFrame.")
         return df
 
     df_dropped = df.drop(columns=cols_found)
-    print(f"✅ Dropped {len(cols_found)} columns: {cols_found}")
+    print(f"✅ Dropped {len(cols_found)} columns: {cols_found.tolist()}")
     return df_dropped
 
-def handle_worked_last_7_days(df, worked_col='worked_last_7_days'):
+def map_worked_last_7_days(df, worked_col='worked_last_7_days', work_map=WORKED_LAST_7_DAYS_MAP, inplace=False):
+    """
+    Maps 'worked_last_7_days' (GSS codes 1/2 or 'Yes'/'No' labels) to a nullable boolean column.
+    Codes may be ints, floats or categories, as returned by either load_raw_data reader or
+    stream_pipeline's chunk reader.
+    Keep it boolean for processing and only map to 'Yes'/'No' for display.
+    Works on a shallow copy unless `inplace=True`.
+    """
+    if df is None or worked_col not in df.columns:
+        print(f"❌ Column '{worked_col}' not found or dataframe empty.")
+        return df
+
+    df_mapped = df if inplace else df.copy(deep=False)
+    if pd.api.types.is_bool_dtype(df_mapped[worked_col]):
+        print(f"ℹ️ Column '{worked_col}' is already boolean.")
+        return df_mapped
+
+    mapped = df_mapped[worked_col].map(work_map)
+    unmapped = mapped.isna() & df_mapped[worked_col].notna()
+    if unmapped.any():
+        print(f"   ⚠️ Found {unmapped.sum()} values in '{worked_col}' not present in the provided map. They are set to missing.")
+    df_mapped[worked_col] = mapped.astype('boolean')
+    print(f"✅ Column '{worked_col}' mapped to boolean (True = worked).")
+    return df_mapped
+
+def handle_worked_last_7_days(df, worked_col='worked_last_7_days', inplace=False, mode_value=None):
     """
     Ensures 'worked_last_7_days' is clean by imputing its missing values with the mode.
-    Assumes the column already contains 'Yes'/'No' or similar text.
+    Assumes the column is already boolean (see map_worked_last_7_days) or contains 'Yes'/'No' text.
+    Pass `mode_value` to use a precomputed mode (e.g. over the whole file) instead of this frame's.
+    Works on a shallow copy unless `inplace=True`.
     """
     if df is None or worked_col not in df.columns:
         print(f"❌ Column '{worked_col}' not found or dataframe empty.")
         return df
 
-    df_handled = df.copy()
+    df_handled = df if inplace else df.copy(deep=False)
 
     print(f"ℹ️ Values in '{worked_col}' before handling:")
     print(df_handled[worked_col].value_counts(dropna=False))
 
     # Check if there are any missing values.
     if df_handled[worked_col].isnull().any():
-        mode_series = df_handled[worked_col].mode()
-        
-        # Check if mode calculation was successful (it might fail if all values were NaN)
-        if not mode_series.empty:
-            mode_val = mode_series[0]
-            df_handled[worked_col].fillna(mode_val, inplace=True)
-            print(f"✅ Imputed {df_handled[worked_col].isnull().sum()} missing '{worked_col}' values with mode ('{mode_val}').")
+        mode_val = mode_value
+        if mode_val is None:
+            mode_val = _mode(df_handled[worked_col]) # None if all values were NaN
+
+        if mode_val is not None:
+            missing_count = df_handled[worked_col].isnull().sum()
+            df_handled[worked_col] = df_handled[worked_col].fillna(mode_val)
+            print(f"✅ Imputed {missing_count} missing '{worked_col}' values with mode ('{mode_val}').")
         else:
             print(f"⚠️ Could not determine mode for '{worked_col}'. Missing values remain.")
     else:
         print(f"ℹ️ No missing values found in '{worked_col}'.")
 
-    # Double check if it contains 'Yes' and 'No' now
+    # Double check if it contains True/False (or 'Yes'/'No') now
+    expected_values = {True, False} if pd.api.types.is_bool_dtype(df_handled[worked_col]) else {'Yes', 'No'}
     current_values = set(df_handled[worked_col].dropna().unique())
-    if not {'Yes', 'No'}.issubset(current_values) and current_values: # Check if it has something other than Yes/No
+    if not expected_values.issubset(current_values) and current_values: # Check if it has something other than the expected values
          print(f"⚠️ Warning: Column '{worked_col}' now contains: {current_values}. Ensure this is expected.")
          
     print(f"✅ Column '{worked_col}' processed.")
     return df_handled
 
-def impute_primary_income_smart(df, worked_col='worked_last_7_days', income_col='primary_job_income_monthly', worked_value='Yes', not_worked_value='No'):
-    """Imputes primary income based on work status, creating 'has_primary_income' flag."""
+def _smart_impute_loop(is_yes, is_no, income, median_income):
+    """Fills missing income in one pass: 0 for non-workers, `median_income` for workers, 0 otherwise.
+
+    Returns (imputed income, has-income flag, # zero-filled, # median-filled, # other rows filled).
+    """
+    n = income.shape[0]
+    imputed = np.empty(n, dtype=np.float64)
+    has_income = np.empty(n, dtype=np.int8)
+    zero_filled = 0
+    median_filled = 0
+    other_filled = 0
+    for i in prange(n):
+        value = income[i]
+        if np.isnan(value):
+            has_income[i] = 0
+            if is_no[i]:
+                imputed[i] = 0.0
+                zero_filled += 1
+            elif is_yes[i]:
+                imputed[i] = median_income
+                median_filled += 1
+            else:
+                imputed[i] = 0.0
+                other_filled += 1
+        else:
+            has_income[i] = 1
+            imputed[i] = value
+    return imputed, has_income, zero_filled, median_filled, other_filled
+
+def _smart_impute_numpy(is_yes, is_no, income, median_income):
+    """Vectorized NumPy equivalent of _smart_impute_loop, used when numba is not installed."""
+    income_na = np.isnan(income)
+    zero_mask = income_na & is_no
+    median_mask = income_na & is_yes & ~is_no
+    other_mask = income_na & ~(is_no | is_yes)
+    imputed = np.where(income_na, 0.0, income)
+    imputed[median_mask] = median_income
+    return (imputed, (~income_na).astype(np.int8),
+            int(zero_mask.sum()), int(median_mask.sum()), int(other_mask.sum()))
+
+# Compiled once per machine (cache=True); repeated calls, e.g. in bootstrap runs, skip pandas overhead
+_smart_impute = njit(cache=True, parallel=True)(_smart_impute_loop) if njit is not None else _smart_impute_numpy
+
+def impute_primary_income_smart(df, worked_col='worked_last_7_days', income_col='primary_job_income_monthly', worked_value=True, not_worked_value=False, inplace=False, median_income=None):
+    """Imputes primary income based on work status, creating 'has_primary_income' flag.
+
+    Pass `median_income` to use a precomputed workers' median (e.g. over the whole file).
+    Works on a shallow copy unless `inplace=True`; only income_col and the flag are replaced.
+    """
     if df is None or income_col not in df.columns or worked_col not in df.columns:
         print("❌ DataFrame or required columns missing for smart income imputation.")
         return df
 
-    df_imputed = df.copy()
+    df_imputed = df if inplace else df.copy(deep=False)
 
-    # 1. Create the 'has_primary_income' flag
-    df_imputed['has_primary_income'] = df_imputed[income_col].notna().astype(int)
-    print("✅ Created 'has_primary_income' flag.")
+    # Contiguous arrays for the imputation kernel
+    income = np.ascontiguousarray(df_imputed[income_col].to_numpy(dtype='float64', na_value=np.nan))
+    is_no = (df_imputed[worked_col] == not_worked_value).to_numpy(dtype=bool, na_value=False)
+    is_yes = (df_imputed[worked_col] == worked_value).to_numpy(dtype=bool, na_value=False)
+    if not (is_no.any() or is_yes.any()):
+        print(f"⚠️ Warning: Neither {worked_value!r} nor {not_worked_value!r} found in '{worked_col}'. Run map_worked_last_7_days first?")
 
-    # 2. Impute 0 for those who didn't work and have missing income
-    no_work_missing_income_mask = (df_imputed[worked_col] == not_worked_value) & (df_imputed[income_col].isna())
-    df_imputed.loc[no_work_missing_income_mask, income_col] = 0
-    print(f"✅ Imputed 0 for {no_work_missing_income_mask.sum()} individuals who didn't work and had missing income.")
+    # Median for those who worked but have missing income
+    income_known = ~np.isnan(income)
+    if median_income is not None:
+        median_income_for_workers = median_income
+    else:
+        worker_incomes = income[is_yes & income_known]
+        median_income_for_workers = np.median(worker_incomes) if worker_incomes.size else np.nan
 
-    # 3. Impute median for those who worked but have missing income
-    median_income_for_workers = df_imputed.loc[(df_imputed[worked_col] == worked_value) & (df_imputed[income_col].notna()), income_col].median()
-    
+    fallback_message = None
     if pd.isna(median_income_for_workers):
-        print("⚠️ Could not calculate median income for workers (maybe none reported?). Using overall median or 0.")
-        median_income_for_workers = df_imputed[income_col].median() # Fallback
+        fallback_message = "⚠️ Could not calculate median income for workers (maybe none reported?). Using overall median or 0."
+        median_income_for_workers = np.median(income[income_known]) if income_known.any() else np.nan # Fallback
         if pd.isna(median_income_for_workers):
             median_income_for_workers = 0 # Final fallback
 
+    imputed_income, has_income, zero_filled, median_filled, other_filled = _smart_impute(
+        is_yes, is_no, income, float(median_income_for_workers)
+    )
+
+    # 1. Create the 'has_primary_income' flag
+    df_imputed['has_primary_income'] = has_income
+    print("✅ Created 'has_primary_income' flag.")
+
+    # 2. Impute 0 for those who didn't work and have missing income
+    print(f"✅ Imputed 0 for {zero_filled} individuals who didn't work and had missing income.")
+
+    # 3. Impute median for those who worked but have missing income
+    if fallback_message:
+        print(fallback_message)
     print(f"ℹ️ Median income for workers used for imputation: {median_income_for_workers:.2f}")
+    print(f"✅ Imputed median ({median_income_for_workers:.2f}) for {median_filled} individuals who worked but had missing income.")
 
-    worked_missing_income_mask = (df_imputed[worked_col] == worked_value) & (df_imputed[income_col].isna())
-    df_imputed.loc[worked_missing_income_mask, income_col] = median_income_for_workers
-    print(f"✅ Imputed median ({median_income_for_workers:.2f}) for {worked_missing_income_mask.sum()} individuals who worked but had missing income.")
+    # 4. Ensure no NaNs remain (rows with unknown work status were filled with 0)
+    if other_filled:
+        print(f"⚠️ {other_filled} NaNs still remain in '{income_col}'. Filling with 0 as a final step.")
 
-    # 4. Ensure no NaNs remain (handle edge cases if any)
-    if df_imputed[income_col].isnull().any():
-        remaining_nans = df_imputed[income_col].isnull().sum()
-        print(f"⚠️ {remaining_nans} NaNs still remain in '{income_col}'. Filling with 0 as a final step.")
-        df_imputed[income_col].fillna(0, inplace=True)
+    if pd.api.types.is_float_dtype(df_imputed[income_col]):
+        imputed_income = imputed_income.astype(df_imputed[income_col].dtype, copy=False)
+    df_imputed[income_col] = imputed_income
 
     print(f"✅ Smart imputation for '{income_col}' completed.")
     return df_imputed
 
+def _lookup_codes(codes, mapping, labels):
+    """Translates integer codes (-1 = missing) into positions in `labels` via a NumPy lookup table; -1 where unmapped."""
+    label_positions = {label: position for position, label in enumerate(labels)}
+    lut = np.full(max(mapping) + 1, -1, dtype=np.int16)
+    for code, label in mapping.items():
+        lut[code] = label_positions[label]
+    in_range = (codes >= 0) & (codes < len(lut))
+    return np.where(in_range, lut[np.clip(codes, 0, len(lut) - 1)], -1)
+
+def _holds_int32_codes(series):
+    """True if every non-missing value is a whole number that survives a cast to int32 unchanged."""
+    if pd.api.types.is_bool_dtype(series):
+        return False
+    if pd.api.types.is_integer_dtype(series):
+        values = series.dropna().to_numpy(dtype='int64')
+    elif pd.api.types.is_float_dtype(series):
+        values = series.dropna().to_numpy(dtype='float64')
+        if not np.all(np.mod(values, 1) == 0):  # Fractional codes such as 1.5 are not codes
+            return False
+    else:
+        return False
+    int32_info = np.iinfo(np.int32)
+    return values.size == 0 or (values.min() >= int32_info.min and values.max() <= int32_info.max)
+
+def _decode_values(series, mapping):
+    """Decodes one column; returns (decoded values, number of non-missing values not in the map)."""
+    # Categoricals (as load_raw_data returns label columns) are decoded through their categories
+    is_categorical = isinstance(series.dtype, pd.CategoricalDtype)
+    code_values = pd.Series(series.cat.categories) if is_categorical else series
+    is_int_coded = (
+        bool(mapping)
+        and all(isinstance(k, (int, np.integer)) and k >= 0 for k in mapping)
+        and _holds_int32_codes(code_values)
+    )
+    if is_int_coded:
+        # Build the Categorical straight from integer codes: no per-row lookup or string allocation
+        codes = code_values.to_numpy(dtype='int32', na_value=-1)
+        labels = list(dict.fromkeys(mapping[key] for key in sorted(mapping)))
+        positions = _lookup_codes(codes, mapping, labels)
+        if is_categorical:
+            # Category i decodes to positions[i]; missing values (code -1) pick the appended -1
+            positions = np.append(positions, -1)[series.cat.codes.to_numpy()]
+        decoded = pd.Categorical.from_codes(positions, categories=labels)
+    else:
+        decoded = series.map(mapping)
+    # Check for values not in the map (on raw arrays, no intermediate Series)
+    unmapped_count = int(np.count_nonzero(pd.isna(np.asarray(decoded)) & ~pd.isna(series.to_numpy())))
+    return decoded, unmapped_count
+
 def decode_categorical(df, column, mapping):
-    """Decodes a categorical column using a mapping dictionary."""
+    """Decodes a categorical column using a mapping dictionary.
+
+    Columns of whole-number codes with non-negative integer keys, including categoricals with
+    such categories, become a pandas Categorical built with Categorical.from_codes (categories
+    in key order); anything else, including fractional codes, uses Series.map.
+    """
     if df is None or column not in df.columns:
         print(f"❌ Column '{column}' not found or dataframe empty.")
         return df
 
     new_col_name = f"{column}_mapped"
-    df[new_col_name] = df[column].map(mapping)
+    decoded, unmapped_count = _decode_values(df[column], mapping)
+    df[new_col_name] = decoded
     print(f"✅ Column '{column}' mapped to '{new_col_name}'.")
-    # Check for values not in the map
-    unmapped = df[new_col_name].isnull() & df[column].notnull()
-    if unmapped.any():
-        print(f"   ⚠️ Found {unmapped.sum()} values in '{column}' not present in the provided map.")
+    if unmapped_count:
+        print(f"   ⚠️ Found {unmapped_count} values in '{column}' not present in the provided map.")
     return df
 
+def decode_categoricals(df, decode_maps, max_workers=None):
+    """Decodes several columns ({column: mapping}) concurrently, like decode_categorical for each.
+
+    The columns are independent and the NumPy/pandas kernels release the GIL, so they are
+    decoded in a thread pool and added with a single assign. Returns a new DataFrame.
+    """
+    if df is None or df.empty:
+        print("❌ Input dataframe is empty. Cannot decode columns.")
+        return df
+
+    decode_specs = [(column, mapping) for column, mapping in decode_maps.items() if column in df.columns]
+    missing = [column for column in decode_maps if column not in df.columns]
+    if missing:
+        print(f"ℹ️ These columns to decode were not found: {missing}")
+    if not decode_specs:
+        return df
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda spec: _decode_values(df[spec[0]], spec[1]), decode_specs))
+
+    df_decoded = df.assign(**{f"{column}_mapped": decoded for (column, _), (decoded, _) in zip(decode_specs, results)})
+    for (column, _), (_, unmapped_count) in zip(decode_specs, results):
+        print(f"✅ Column '{column}' mapped to '{column}_mapped'.")
+        if unmapped_count:
+            print(f"   ⚠️ Found {unmapped_count} values in '{column}' not present in the provided map.")
+    return df_decoded
+
+
+def _read_csv_chunks(file_path, columns, chunksize):
+    """Yields chunks of `columns` from the raw CSV with the RAW_COLUMN_DTYPES and RAW_LENIENT_NUMERIC_DTYPES dtypes.
+
+    Label columns keep the type pandas infers (numbers for GSS codes, strings for text
+    labels) instead of 'category': per-chunk categories would differ from chunk to
+    chunk, so stream_pipeline casts them to file-wide categories itself.
+    """
+    wanted = set(columns)
+    dtypes = {col: dtype for col, dtype in RAW_COLUMN_DTYPES.items() if col in wanted and dtype != 'category'}
+    reader = pd.read_csv(
+        file_path,
+        usecols=lambda col: col in wanted,
+        dtype=dtypes,
+        encoding=RAW_DATA_ENCODING,
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        yield _coerce_lenient_numeric(chunk)
+
+def _median_from_counts(counts):
+    """Median of the values tallied in a value_counts Series (averages the middle pair, like Series.median)."""
+    counts = counts[counts > 0].sort_index()
+    if counts.empty:
+        return np.nan
+    cumulative = counts.to_numpy().cumsum()
+    total = cumulative[-1]
+    values = counts.index.to_numpy(dtype='float64')
+    lower = values[np.searchsorted(cumulative, (total + 1) // 2)]
+    upper = values[np.searchsorted(cumulative, total // 2 + 1)]
+    return (lower + upper) / 2
+
+def stream_pipeline(raw_path, out_path, chunksize=200_000, min_age=MINIMUM_AGE_FOR_ANALYSIS,
+                    column_map=COLUMNS_TO_EXTRACT, columns_to_drop=COLUMNS_TO_DROP_AFTER_AGE_FILTER,
+                    strategies=IMPUTATION_STRATEGIES, worked_col='worked_last_7_days',
+                    income_col='primary_job_income_monthly'):
+    """Cleans the raw CSV chunk by chunk and appends each cleaned chunk to a Parquet file.
+
+    A first pass tallies value counts over the age-filtered rows, so the mode/median fill
+    values are computed over the whole file and every chunk is imputed consistently. It also
+    collects the label categories and integer ranges of the whole file, so the Parquet schema
+    (category labels, nullable 'boolean'/'Int' columns, downcast integers) matches the
+    output of run_cleaning_pipeline.
+    Peak memory is bounded by `chunksize` rather than the file size.
+    Returns the number of rows written, or None on error.
+    """
+    if not os.path.exists(raw_path):
+        print(f"❌ Error: File not found at '{raw_path}'.")
+        return None
+    if pq is None:
+        print("❌ Error: PyArrow is required to stream to Parquet.")
+        return None
+
+    header = pd.read_csv(raw_path, nrows=0, encoding=RAW_DATA_ENCODING).columns
+    missing = [orig for orig in column_map if orig not in header]
+    if missing:
+        print(f"⚠️ Warning: The following columns were not found and will be skipped: {missing}")
+    column_map = {orig: new for orig, new in column_map.items() if orig in header}
+    raw_names = {new: orig for orig, new in column_map.items()}
+    stat_cols = [col for col, strategy in strategies.items() if strategy in ('median', 'mode') and col in raw_names]
+    label_cols = [new for orig, new in column_map.items() if RAW_COLUMN_DTYPES.get(orig) == 'category']
+    raw_dtypes = {**RAW_COLUMN_DTYPES, **RAW_LENIENT_NUMERIC_DTYPES}
+    int_cols = [new for orig, new in column_map.items()
+                if orig in raw_dtypes and pd.api.types.is_integer_dtype(pd.api.types.pandas_dtype(raw_dtypes[orig]))]
+
+    # --- Pass 1: global statistics from value counts (memory ~ number of distinct values) ---
+    print("\n--- Stream pass 1: computing global imputation statistics ---")
+    first_pass_cols = ['age', worked_col, income_col, *stat_cols, *label_cols, *int_cols]
+    first_pass_map = {raw_names[col]: col for col in first_pass_cols if col in raw_names}
+    counts = {col: pd.Series(dtype='float64') for col in [worked_col, *stat_cols] if col in raw_names}
+    labels = {col: set() for col in label_cols}
+    labels_have_missing = set()
+    int_ranges = {}
+    worker_income_counts = pd.Series(dtype='float64')
+    has_worker_income = worked_col in raw_names and income_col in raw_names
+    try:
+        for chunk in _read_csv_chunks(raw_path, list(first_pass_map.keys()), chunksize):
+            chunk = select_and_rename_cols(chunk, first_pass_map)
+            if chunk is None:
+                continue
+            # Categories and integer widths are taken over all rows, as load_raw_data does
+            for col in label_cols:
+                labels[col].update(chunk[col].dropna().unique())
+                if chunk[col].hasnans:
+                    labels_have_missing.add(col)
+            for col in int_cols:
+                lowest, highest = chunk[col].min(), chunk[col].max()
+                if pd.isna(lowest):
+                    continue
+                if col in int_ranges:
+                    lowest, highest = min(lowest, int_ranges[col][0]), max(highest, int_ranges[col][1])
+                int_ranges[col] = (lowest, highest)
+            chunk = filter_by_age(chunk, min_age)
+            if chunk is None or chunk.empty:
+                continue
+            if worked_col in chunk.columns:
+                chunk = map_worked_last_7_days(chunk, worked_col)
+            for col in counts:
+                counts[col] = counts[col].add(chunk[col].value_counts(dropna=True), fill_value=0)
+            if has_worker_income:
+                is_worker = chunk[worked_col].to_numpy(dtype=bool, na_value=False)
+                worker_income_counts = worker_income_counts.add(
+                    chunk.loc[is_worker, income_col].value_counts(dropna=True), fill_value=0
+                )
+    except ValueError as e:  # e.g. a blank ID in an int32 column
+        print(f"❌ Error: Could not read '{raw_path}': {e}")
+        return None
+
+    worked_mode = _mode_from_counts(counts[worked_col]) if worked_col in counts else None
+    median_income = _median_from_counts(worker_income_counts)
+    fill_strategies = {}
+    for col, strategy in strategies.items():
+        if col not in raw_names:
+            continue
+        if strategy == 'median':
+            value = float(_median_from_counts(counts[col])) if pd.api.types.is_numeric_dtype(counts[col].index) else np.nan
+        elif strategy == 'mode':
+            value = _mode_from_counts(counts[col])
+        else:
+            value = strategy
+        if value is not None and not pd.isna(value):
+            fill_strategies[col] = value
+    print(f"✅ Global statistics ready: workers' median income {median_income:.2f}, fill values {fill_strategies}.")
+
+    # Same dtypes as load_raw_data + optimize_dtypes would give for the whole file
+    output_dtypes = {}
+    for col, values in labels.items():
+        categories = pd.Index(sorted(values))
+        if col in labels_have_missing and pd.api.types.is_integer_dtype(categories):
+            categories = categories.astype('float64')  # Integer codes with gaps are parsed as floats
+        output_dtypes[col] = pd.CategoricalDtype(categories)
+    for col, (lowest, highest) in int_ranges.items():
+        raw_dtype = raw_dtypes[raw_names[col]]
+        output_dtypes[col] = pd.to_numeric(pd.Series([lowest, highest], dtype=raw_dtype), downcast='integer').dtype
+
+    # --- Pass 2: clean each chunk with the global statistics and append it ---
+    print("\n--- Stream pass 2: cleaning and writing chunks ---")
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    writer = None
+    rows_written = 0
+    try:
+        for chunk_number, chunk in enumerate(_read_csv_chunks(raw_path, list(column_map.keys()), chunksize), start=1):
+            print(f"\n--- Chunk {chunk_number} ---")
+            chunk = filter_by_age(select_and_rename_cols(chunk, column_map), min_age)
+            if chunk is None or chunk.empty:
+                continue
+            chunk = drop_columns(chunk, columns_to_drop)
+            chunk = chunk.astype({col: dtype for col, dtype in output_dtypes.items() if col in chunk.columns})
+            chunk = map_worked_last_7_days(chunk, worked_col, inplace=True)
+            chunk = handle_worked_last_7_days(chunk, worked_col, inplace=True, mode_value=worked_mode)
+            chunk = impute_primary_income_smart(chunk, worked_col, income_col, inplace=True, median_income=median_income)
+            chunk = impute_missing_values(chunk, fill_strategies, inplace=True)
+
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                # An all-missing text column in the first chunk would otherwise be typed as null
+                schema = pa.schema([
+                    field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                    for field in table.schema
+                ], metadata=table.schema.metadata)  # Keep the pandas metadata so nullable/categorical dtypes round-trip
+                writer = pq.ParquetWriter(out_path, schema, compression='zstd')
+            table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows_written += len(chunk)
+    except ValueError as e:  # e.g. text in a float32 column that pass 1 did not read
+        print(f"❌ Error: Could not read '{raw_path}' after {rows_written} rows: {e}")
+        return None
+    finally:
+        if writer is not None:
+            writer.close()
+
+    print(f"✅ Streamed {rows_written} cleaned rows to '{out_path}'.")
+    return rows_written
 
 def save_data(df, file_path):
-    """Saves a DataFrame to a CSV file, creating directories if needed."""
+    """Saves a DataFrame, creating directories if needed.
+
+    The format follows the file extension: '.parquet' (zstd-compressed) or '.feather'
+    are written column-wise with PyArrow; anything else is written as CSV. Without PyArrow
+    the columnar formats fall back to a CSV next to the requested path, with a warning.
+    """
     if df is None or df.empty:
         print(f"❌ DataFrame is empty. Cannot save to '{file_path}'.")
         return
 
+    if pa is None and os.path.splitext(file_path)[1].lower() in ('.parquet', '.feather'):
+        csv_path = os.path.splitext(file_path)[0] + '.csv'
+        print(f"⚠️ Warning: PyArrow is not installed, so '{file_path}' cannot be written. Saving CSV to '{csv_path}' instead.")
+        file_path = csv_path
+
     try:
         # Create the directory if it doesn't exist
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        df.to_csv(file_path, index=False)
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == '.parquet':
+            df.to_parquet(file_path, engine='pyarrow', compression='zstd', index=False)
+        elif extension == '.feather':
+            df.reset_index(drop=True).to_feather(file_path)
+        else:
+            df.to_csv(file_path, index=False)
         print(f"✅ Data saved successfully to '{file_path}'")
     except Exception as e:
         print(f"❌ Error saving data to '{file_path}': {e}")
 
-print("✅ Data processing functions defined.")
\ No newline at end of file
+def _pipe_until_empty(df, steps):
+    """Applies (func, args, kwargs) steps with DataFrame.pipe, stopping once a step returns None or an empty frame."""
+    for func, args, kwargs in steps:
+        df = df.pipe(func, *args, **kwargs)
+        if df is None or df.empty:
+            print(f"❌ Pipeline stopped after '{func.__name__}': no data left to process.")
+            return None
+    return df
+
+def run_cleaning_pipeline(raw_path=RAW_DATA_PATH, out_path=CLEANED_DATA_PATH, min_age=MINIMUM_AGE_FOR_ANALYSIS):
+    """Runs the full cleaning pipeline (as in notebook 01) as one pipe chain and saves the result.
+
+    The frame is owned by the chain after the age filter, so later steps run in place.
+    Returns the cleaned DataFrame, or None if loading or any step leaves no data.
+    """
+    df_raw = load_raw_data(raw_path)
+    if df_raw is None:
+        return None
+
+    df_cleaned = _pipe_until_empty(df_raw, [
+        (select_and_rename_cols, (COLUMNS_TO_EXTRACT,), {}),
+        (filter_by_age, (min_age,), {}),
+        (drop_columns, (COLUMNS_TO_DROP_AFTER_AGE_FILTER,), {}),
+        (map_worked_last_7_days, (), {'inplace': True}),
+        (handle_worked_last_7_days, (), {'inplace': True}),
+        (impute_primary_income_smart, (), {'inplace': True}),
+        (impute_missing_values, (IMPUTATION_STRATEGIES,), {'inplace': True}),
+    ])
+    if df_cleaned is None:
+        return None
+
+    save_data(df_cleaned, out_path)
+    return df_cleaned
+
+print("✅ Data processing functions defined.")
+
+if __name__ == "__main__":
+    # Copy-on-Write lets the pipeline share column buffers until a step replaces them.
+    # It is always on from pandas 3.0, where the option is deprecated.
+    if not _copy_on_write_enabled():
+        pd.options.mode.copy_on_write = True
+    run_cleaning_pipeline()
\ No newline at end of file
@@ -0,0 +1,31 @@
+# src/utils.py
+import codecs
+
+def detect_encoding(file_path, sample_size=65536):
+    """Guesses the text encoding of a file from its first `sample_size` bytes.
+
+    Uses chardet when it is installed; otherwise returns the first of UTF-8,
+    windows-1252 and ISO-8859-1 that decodes the sample.
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+
+    try:
+        import chardet
+    except ImportError:
+        chardet = None
+
+    if chardet is not None:
+        result = chardet.detect(sample)
+        if result.get('encoding'):
+            print(f"✅ Detected encoding '{result['encoding']}' (confidence {result['confidence']:.2f}) for '{file_path}'.")
+            return result['encoding']
+
+    for encoding in ('utf-8', 'windows-1252', 'ISO-8859-1'):
+        try:
+            # final=False: the sample may end in the middle of a multi-byte character
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        except UnicodeDecodeError:
+            continue
+        print(f"✅ Sample of '{file_path}' decodes as '{encoding}'.")
+        return encoding